@@ -0,0 +1,441 @@
+"""
+Local load-test harness for the API.
+
+Boots `app.main:app` under uvicorn against a synthetic (or fixture) fplcache tree,
+replays a traffic mix and writes a machine-readable JSON report.
+
+Traffic mix per run (each run gets a freshly booted, cold server):
+- stampede: a burst of concurrent timeseries requests right after startup
+- steady: closed-loop virtual users for a fixed duration; each iteration is either
+  a timeseries request for a Zipf-popular player code or a search keystroke burst
+  (one request per typed prefix of a Zipf-popular player's name)
+
+Usage:
+    PYTHONPATH=. uv run python scripts/loadtest.py --workers 1 2 4 --players 200 800
+    PYTHONPATH=. uv run python scripts/loadtest.py --cache-dir vendor/fplcache -o report.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import bisect
+import contextlib
+import json
+import lzma
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence
+
+import httpx
+
+from app.core.gw_index import SEASON_2023_24, SEASON_2024_25
+from app.core.player_directory import PlayerSummary, build_player_directory
+from app.data.fplcache_io import parse_snapshot_datetime
+
+SEARCH_ENDPOINT = "GET /players/search"
+TIMESERIES_ENDPOINT = "GET /players/{player_code}/timeseries"
+
+_SYLLABLES = ["sa", "la", "ke", "ro", "mi", "ta", "no", "vi", "da", "re", "lu", "ka", "po", "zi"]
+
+
+def write_synthetic_cache(
+    root: Path, players: int, gameweeks: int = 38, seed: int = 0
+) -> List[Path]:
+    """
+    Write a synthetic fplcache tree under root/cache with one snapshot per GW per season.
+
+    Snapshots land just before the next GW deadline so every GW is indexed.
+    Player codes are stable across seasons and total_points is cumulative.
+    Returns the written snapshot paths.
+    """
+    rng = random.Random(seed)
+    elements = []
+    for i in range(players):
+        name = "".join(rng.choice(_SYLLABLES) for _ in range(rng.randint(2, 4)))
+        elements.append({"id": i + 1, "code": 100000 + i, "web_name": name.capitalize()})
+
+    written: List[Path] = []
+    for season in (SEASON_2023_24, SEASON_2024_25):
+        first_deadline = season.start + timedelta(days=10, hours=17, minutes=30)
+        deadlines = [first_deadline + timedelta(weeks=i) for i in range(gameweeks)]
+        events = [
+            {"id": i + 1, "deadline_time": d.strftime("%Y-%m-%dT%H:%M:%SZ")}
+            for i, d in enumerate(deadlines)
+        ]
+        totals = [0] * players
+        for gw in range(gameweeks):
+            for i in range(players):
+                totals[i] += rng.randint(0, 12)
+            snap = {
+                "events": events,
+                "elements": [{**el, "total_points": totals[i]} for i, el in enumerate(elements)],
+            }
+            written.append(_write_snapshot(root, deadlines[gw] + timedelta(days=6), snap))
+    return written
+
+
+def _write_snapshot(root: Path, ts: datetime, payload: Dict) -> Path:
+    path = root / "cache" / f"{ts.year}" / f"{ts.month}" / f"{ts.day}" / f"{ts:%H%M}.json.xz"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with lzma.open(path, "wt", encoding="utf-8") as fh:
+        json.dump(payload, fh)
+    return path
+
+
+def load_directory(fplcache_dir: Path) -> Dict[int, PlayerSummary]:
+    """
+    Build the player directory from the latest snapshot, as the API does at startup.
+    """
+    snaps = sorted(
+        (parse_snapshot_datetime(p), p) for p in (fplcache_dir / "cache").rglob("*.json.xz")
+    )
+    if not snaps:
+        raise FileNotFoundError(f"No snapshots found under {fplcache_dir / 'cache'}")
+    return build_player_directory(snaps[-1][1])
+
+
+def zipf_cum_weights(n: int, s: float) -> List[float]:
+    """
+    Cumulative Zipf weights for ranks 1..n (weight of rank k is 1 / k**s).
+    """
+    cum: List[float] = []
+    total = 0.0
+    for k in range(1, n + 1):
+        total += 1.0 / (k**s)
+        cum.append(total)
+    return cum
+
+
+def percentile(sorted_values: Sequence[float], q: float) -> Optional[float]:
+    """
+    Linear-interpolated percentile (q in [0, 100]) of an already sorted sequence.
+    """
+    if not sorted_values:
+        return None
+    pos = (len(sorted_values) - 1) * q / 100.0
+    lo = int(pos)
+    hi = min(lo + 1, len(sorted_values) - 1)
+    return sorted_values[lo] + (sorted_values[hi] - sorted_values[lo]) * (pos - lo)
+
+
+@dataclass(frozen=True)
+class Sample:
+    endpoint: str
+    latency: float  # seconds
+    status: Optional[int]  # None on transport error
+
+
+def summarize(samples: List[Sample], elapsed: float) -> Dict[str, object]:
+    """
+    Aggregate samples into per-endpoint RPS, error rate and latency percentiles (ms).
+    Non-2xx responses and transport errors count as errors.
+    """
+    by_endpoint: Dict[str, List[Sample]] = {}
+    for s in samples:
+        by_endpoint.setdefault(s.endpoint, []).append(s)
+
+    endpoints: Dict[str, object] = {}
+    for name in sorted(by_endpoint):
+        group = by_endpoint[name]
+        errors = sum(1 for s in group if s.status is None or not 200 <= s.status < 300)
+        latencies = sorted(s.latency * 1000.0 for s in group)
+        statuses: Dict[str, int] = {}
+        for s in group:
+            key = "error" if s.status is None else str(s.status)
+            statuses[key] = statuses.get(key, 0) + 1
+        endpoints[name] = {
+            "requests": len(group),
+            "errors": errors,
+            "error_rate": round(errors / len(group), 6),
+            "rps": round(len(group) / elapsed, 3) if elapsed > 0 else None,
+            "statuses": statuses,
+            "latency_ms": {
+                "p50": _round(percentile(latencies, 50)),
+                "p95": _round(percentile(latencies, 95)),
+                "p99": _round(percentile(latencies, 99)),
+                "mean": _round(sum(latencies) / len(latencies)),
+                "max": _round(latencies[-1]),
+            },
+        }
+    return {
+        "duration_s": round(elapsed, 3),
+        "requests": len(samples),
+        "rps": round(len(samples) / elapsed, 3) if elapsed > 0 else None,
+        "endpoints": endpoints,
+    }
+
+
+def _round(value: Optional[float]) -> Optional[float]:
+    return None if value is None else round(value, 3)
+
+
+class TrafficMix:
+    """
+    Draws player codes and search bursts; popularity follows a Zipf distribution
+    over a seeded shuffle of the directory so rank is unrelated to code order.
+    """
+
+    def __init__(self, directory: Dict[int, PlayerSummary], zipf_s: float, seed: int) -> None:
+        self.players = sorted(directory.values(), key=lambda p: p.code)
+        random.Random(seed).shuffle(self.players)
+        self.cum_weights = zipf_cum_weights(len(self.players), zipf_s)
+
+    def pick(self, rng: random.Random) -> PlayerSummary:
+        x = rng.random() * self.cum_weights[-1]
+        return self.players[bisect.bisect_left(self.cum_weights, x)]
+
+    def search_burst(self, rng: random.Random, max_keystrokes: int) -> List[str]:
+        name = self.pick(rng).web_name_lower
+        return [name[:i] for i in range(1, min(len(name), max_keystrokes) + 1)]
+
+
+async def _request(
+    client: httpx.AsyncClient,
+    samples: List[Sample],
+    endpoint: str,
+    url: str,
+    params: Optional[Dict[str, str]] = None,
+) -> None:
+    start = time.perf_counter()
+    try:
+        resp = await client.get(url, params=params)
+        status: Optional[int] = resp.status_code
+    except httpx.HTTPError:
+        status = None
+    samples.append(Sample(endpoint, time.perf_counter() - start, status))
+
+
+async def _timeseries(
+    client: httpx.AsyncClient, samples: List[Sample], player: PlayerSummary
+) -> None:
+    await _request(client, samples, TIMESERIES_ENDPOINT, f"/players/{player.code}/timeseries")
+
+
+async def run_stampede(
+    client: httpx.AsyncClient, mix: TrafficMix, size: int, seed: int
+) -> Dict[str, object]:
+    """
+    Fire `size` timeseries requests at once against a cold server.
+    Codes are Zipf-drawn, so hot players are requested concurrently several times.
+    """
+    rng = random.Random(seed)
+    samples: List[Sample] = []
+    start = time.perf_counter()
+    await asyncio.gather(*(_timeseries(client, samples, mix.pick(rng)) for _ in range(size)))
+    return summarize(samples, time.perf_counter() - start)
+
+
+async def run_steady(
+    client: httpx.AsyncClient,
+    mix: TrafficMix,
+    *,
+    concurrency: int,
+    duration: float,
+    search_ratio: float,
+    max_keystrokes: int,
+    keystroke_delay: float,
+    seed: int,
+) -> Dict[str, object]:
+    """
+    Closed-loop virtual users issuing timeseries requests or search bursts until `duration`.
+    """
+    samples: List[Sample] = []
+    start = time.perf_counter()
+    deadline = start + duration
+
+    async def user(user_id: int) -> None:
+        rng = random.Random(seed * 1_000_003 + user_id)
+        while time.perf_counter() < deadline:
+            if rng.random() < search_ratio:
+                for prefix in mix.search_burst(rng, max_keystrokes):
+                    await _request(
+                        client, samples, SEARCH_ENDPOINT, "/players/search", {"q": prefix}
+                    )
+                    if keystroke_delay > 0:
+                        await asyncio.sleep(keystroke_delay)
+            else:
+                await _timeseries(client, samples, mix.pick(rng))
+
+    await asyncio.gather(*(user(i) for i in range(concurrency)))
+    return summarize(samples, time.perf_counter() - start)
+
+
+def _free_port(host: str) -> int:
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+        s.bind((host, 0))
+        return s.getsockname()[1]
+
+
+@contextlib.contextmanager
+def serve(fplcache_dir: Path, workers: int, host: str, timeout: float) -> Iterator[str]:
+    """
+    Boot `app.main:app` under uvicorn in a subprocess and yield its base URL once ready.
+    """
+    port = _free_port(host)
+    env = {**os.environ, "FPLCACHE_DIR": str(fplcache_dir)}
+    cmd = [
+        sys.executable,
+        "-m",
+        "uvicorn",
+        "app.main:app",
+        "--host",
+        host,
+        "--port",
+        str(port),
+        "--workers",
+        str(workers),
+        "--log-level",
+        "warning",
+        "--no-access-log",
+    ]
+    proc = subprocess.Popen(cmd, env=env)
+    base_url = f"http://{host}:{port}"
+    try:
+        _wait_ready(proc, base_url, timeout)
+        yield base_url
+    finally:
+        proc.terminate()
+        try:
+            proc.wait(timeout=15)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+            proc.wait()
+
+
+def _wait_ready(proc: subprocess.Popen, base_url: str, timeout: float) -> None:
+    # /health answers only after startup, but startup swallows cache errors;
+    # a search probe confirms the directory was actually built.
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if proc.poll() is not None:
+            raise RuntimeError(f"uvicorn exited with code {proc.returncode} during startup")
+        try:
+            resp = httpx.get(f"{base_url}/players/search", params={"q": "a"}, timeout=2.0)
+        except httpx.HTTPError:
+            time.sleep(0.1)
+            continue
+        if resp.status_code == 200:
+            return
+        raise RuntimeError(f"Server started but cache not loaded: {resp.text}")
+    raise TimeoutError(f"Server at {base_url} not ready after {timeout}s")
+
+
+async def _run_load(base_url: str, mix: TrafficMix, args: argparse.Namespace) -> Dict:
+    limits = httpx.Limits(max_connections=max(args.concurrency, args.stampede, 1))
+    async with httpx.AsyncClient(
+        base_url=base_url, timeout=args.request_timeout, limits=limits
+    ) as client:
+        phases: Dict[str, object] = {}
+        if args.stampede > 0:
+            phases["stampede"] = await run_stampede(client, mix, args.stampede, args.seed)
+        phases["steady"] = await run_steady(
+            client,
+            mix,
+            concurrency=args.concurrency,
+            duration=args.duration,
+            search_ratio=args.search_ratio,
+            max_keystrokes=args.max_keystrokes,
+            keystroke_delay=args.keystroke_delay,
+            seed=args.seed,
+        )
+        return phases
+
+
+def _git_rev() -> Optional[str]:
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return out.stdout.strip() or None
+
+
+def _run_one(fplcache_dir: Path, workers: int, args: argparse.Namespace) -> Dict[str, object]:
+    directory = load_directory(fplcache_dir)
+    snapshots = sum(1 for _ in (fplcache_dir / "cache").rglob("*.json.xz"))
+    mix = TrafficMix(directory, args.zipf_s, args.seed)
+    print(
+        f"run: workers={workers} players={len(directory)} snapshots={snapshots}",
+        file=sys.stderr,
+    )
+    with serve(fplcache_dir, workers, args.host, args.startup_timeout) as base_url:
+        phases = asyncio.run(_run_load(base_url, mix, args))
+    return {
+        "workers": workers,
+        "players": len(directory),
+        "snapshots": snapshots,
+        "phases": phases,
+    }
+
+
+def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument(
+        "--cache-dir",
+        type=Path,
+        default=None,
+        help="Existing fplcache dir (containing cache/). Default: synthetic cache per --players.",
+    )
+    parser.add_argument("--players", type=int, nargs="+", default=[600])
+    parser.add_argument("--gameweeks", type=int, default=38)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1])
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--duration", type=float, default=20.0, help="Steady phase seconds.")
+    parser.add_argument("--stampede", type=int, default=64, help="0 disables the phase.")
+    parser.add_argument("--search-ratio", type=float, default=0.3)
+    parser.add_argument("--zipf-s", type=float, default=1.1)
+    parser.add_argument("--max-keystrokes", type=int, default=6)
+    parser.add_argument("--keystroke-delay", type=float, default=0.05)
+    parser.add_argument("--request-timeout", type=float, default=30.0)
+    parser.add_argument("--startup-timeout", type=float, default=120.0)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("-o", "--output", type=Path, default=None, help="Default: stdout.")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    args = parse_args(argv)
+    runs: List[Dict[str, object]] = []
+
+    if args.cache_dir is not None:
+        for workers in args.workers:
+            runs.append(_run_one(args.cache_dir, workers, args))
+    else:
+        for players in args.players:
+            with tempfile.TemporaryDirectory(prefix="fplcache-synthetic-") as tmp:
+                write_synthetic_cache(Path(tmp), players, args.gameweeks, args.seed)
+                for workers in args.workers:
+                    runs.append(_run_one(Path(tmp), workers, args))
+
+    report = {
+        "generated_at": datetime.now(timezone.utc).isoformat(),
+        "git_rev": _git_rev(),
+        "cache": "fixture" if args.cache_dir is not None else "synthetic",
+        "config": {
+            k: (str(v) if isinstance(v, Path) else v)
+            for k, v in vars(args).items()
+            if k != "output"
+        },
+        "runs": runs,
+    }
+    text = json.dumps(report, indent=2)
+    if args.output is None:
+        print(text)
+    else:
+        args.output.write_text(text + "\n", encoding="utf-8")
+        print(f"report written to {args.output}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+import random
+from pathlib import Path
+
+import pytest
+
+from app.core.gw_index import build_all_indices
+from app.core.timeseries import build_total_points_timeseries_by_code
+from app.data.fplcache_io import parse_snapshot_datetime
+from scripts.loadtest import (
+    TIMESERIES_ENDPOINT,
+    Sample,
+    TrafficMix,
+    load_directory,
+    percentile,
+    summarize,
+    write_synthetic_cache,
+)
+
+
+def test_percentile_interpolates() -> None:
+    values = [10.0, 20.0, 30.0, 40.0]
+    assert percentile(values, 0) == 10.0
+    assert percentile(values, 50) == pytest.approx(25.0)
+    assert percentile(values, 100) == 40.0
+    assert percentile([], 50) is None
+
+
+def test_summarize_counts_errors_and_rps() -> None:
+    samples = [
+        Sample(TIMESERIES_ENDPOINT, 0.010, 200),
+        Sample(TIMESERIES_ENDPOINT, 0.020, 404),
+        Sample(TIMESERIES_ENDPOINT, 0.030, None),
+        Sample(TIMESERIES_ENDPOINT, 0.040, 200),
+    ]
+    stats = summarize(samples, elapsed=2.0)["endpoints"][TIMESERIES_ENDPOINT]
+    assert stats["requests"] == 4
+    assert stats["errors"] == 2
+    assert stats["error_rate"] == 0.5
+    assert stats["rps"] == 2.0
+    assert stats["statuses"] == {"200": 2, "404": 1, "error": 1}
+    assert stats["latency_ms"]["max"] == 40.0
+
+
+def test_synthetic_cache_indexes_every_gw(tmp_path: Path) -> None:
+    paths = write_synthetic_cache(tmp_path, players=5, gameweeks=3)
+    snaps = sorted((parse_snapshot_datetime(p), p) for p in paths)
+    indices = build_all_indices(snaps)
+    assert {season: sorted(idx) for season, idx in indices.items()} == {
+        "2023-24": [1, 2, 3],
+        "2024-25": [1, 2, 3],
+    }
+
+    directory = load_directory(tmp_path)
+    assert len(directory) == 5
+    ts = build_total_points_timeseries_by_code(next(iter(directory)), indices)
+    assert len(ts["points"]) == 6
+    assert all(pt["value"] is not None for pt in ts["points"])
+
+
+def test_traffic_mix_is_skewed_towards_top_rank(tmp_path: Path) -> None:
+    write_synthetic_cache(tmp_path, players=50, gameweeks=1)
+    mix = TrafficMix(load_directory(tmp_path), zipf_s=1.2, seed=0)
+    rng = random.Random(0)
+    picks = [mix.pick(rng).code for _ in range(2000)]
+    top = mix.players[0].code
+    assert picks.count(top) > picks.count(mix.players[-1].code) * 5
+
+    burst = mix.search_burst(rng, max_keystrokes=3)
+    assert burst == [burst[-1][:i] for i in range(1, len(burst) + 1)]
+    assert len(burst) <= 3